@@ -20,12 +20,15 @@ Usage examples:
 
   # generate all variants and stage all into src/crc
   python scripts/generate_crc8.py --algos bit,nibble,nibblem,byte
+
+  # ignore cached pycrc outputs and regenerate (e.g. to refresh timestamps)
+  python scripts/generate_crc8.py --no-cache
 """
 
 from __future__ import annotations
 
-import subprocess
-import sys
+import hashlib
+import shutil
 from pathlib import Path
 from typing import Iterable
 
@@ -33,6 +36,7 @@ SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
 C99_DIR = REPO_ROOT / "dist" / "crc" / "c99"
 C99_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = REPO_ROOT / "dist" / "crc" / ".cache"
 
 SRC_CRC_DIR = REPO_ROOT / "src" / "crc"
 
@@ -47,68 +51,104 @@ ALGO_FLAGS = {
 }
 
 
-def run(cmd: Iterable[str]) -> None:
-    print(">>", " ".join(cmd))
-    subprocess.run(list(cmd), check=True)
+def load_pycrc():
+    """Import pycrc's option parser and code generator once per run."""
+    try:
+        import pycrc
+        import pycrc.codegen as codegen
+        from pycrc.opt import Options
+    except ImportError as exc:
+        raise SystemExit("pycrc is required: python -m pip install pycrc") from exc
+    return pycrc.__version__, Options, codegen
+
+
+def pycrc_args(algo: str, mode: str, out: Path) -> list[str]:
+    """Build the pycrc command line for one generated file."""
+    return [
+        "--model",
+        MODEL,
+        "--std",
+        "C99",
+        *ALGO_FLAGS[algo],
+        "--generate",
+        mode,
+        "-o",
+        str(out),
+    ]
+
+
+def cache_key(version: str, args: list[str]) -> str:
+    """Hash the pycrc version and arguments that determine a generated file.
+
+    Only the basename of the ``-o`` target affects pycrc output (it names
+    the header guard and include), so the output directory is left out.
+    """
+    parts = [version, *args[:-1], Path(args[-1]).name]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
 
+def generate_c99_variants(algos: Iterable[str], use_cache: bool = True) -> None:
+    """Run pycrc in-process to generate .h / .c for each requested algorithm token.
 
-def generate_c99_variants(algos: Iterable[str]) -> None:
-    """Invoke pycrc to generate .h / .c for each requested algorithm token."""
+    Driving pycrc through its Python API instead of ``python -m pycrc``
+    avoids paying interpreter startup and pycrc import for every file.
+    Outputs are cached under dist/crc/.cache keyed by pycrc version and
+    arguments, so re-runs with unchanged inputs copy instead of regenerate.
+    """
     for algo in algos:
         if algo not in ALGO_FLAGS:
             raise SystemExit(f"Unknown algorithm token: {algo}")
 
+    version, Options, codegen = load_pycrc()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
     for algo in algos:
         fileroot = f"crc8_{algo}"
-        flags = ALGO_FLAGS[algo]
-
-        h_out = C99_DIR / f"{fileroot}.h"
-        c_out = C99_DIR / f"{fileroot}.c"
-
-        # Generate header
-        run(
-            [
-                sys.executable,
-                "-m",
-                "pycrc",
-                "--model",
-                MODEL,
-                "--std",
-                "C99",
-                *flags,
-                "--generate",
-                "h",
-                "-o",
-                str(h_out),
-            ]
-        )
-
-        # Generate source
-        run(
-            [
-                sys.executable,
-                "-m",
-                "pycrc",
-                "--model",
-                MODEL,
-                "--std",
-                "C99",
-                *flags,
-                "--generate",
-                "c",
-                "-o",
-                str(c_out),
-            ]
-        )
+        for mode in ("h", "c"):
+            out = C99_DIR / f"{fileroot}.{mode}"
+            args = pycrc_args(algo, mode, out)
+            cached = CACHE_DIR / f"{cache_key(version, args)}.{mode}"
+
+            if use_cache:
+                try:
+                    shutil.copyfile(cached, out)
+                except FileNotFoundError:
+                    pass
+                else:
+                    print(f">> cached {out.name} ({cached.name})")
+                    continue
+
+            print(">> pycrc", " ".join(args))
+            opt = Options("pycrc", version, "https://pycrc.org")
+            opt.parse(args)
+            out.write_text(str(codegen.File(opt, "")))
+            shutil.copyfile(out, cached)
+
+
+def is_identical(src: Path, dst: Path) -> bool:
+    """Return True if dst already holds exactly the bytes of src.
+
+    Sizes are compared first so differing files are rejected without
+    reading either one.
+    """
+    try:
+        if src.stat().st_size != dst.stat().st_size:
+            return False
+    except FileNotFoundError:
+        return False
+    return src.read_bytes() == dst.read_bytes()
 
 
 def stage_variants(algos: Iterable[str]) -> int:
     """Copy the generated c99 outputs from dist/crc/c99 -> src/crc.
 
     Default behavior is to stage header + source matching each fileroot.
+    Files whose staged copy is already identical are left untouched so
+    their timestamps (and downstream rebuilds) are not disturbed.
     Returns 0 on success, non-zero on failure.
     """
     copied = 0
+    unchanged = 0
     SRC_CRC_DIR.mkdir(parents=True, exist_ok=True)
 
     for algo in algos:
@@ -120,15 +160,17 @@ def stage_variants(algos: Iterable[str]) -> int:
             return 1
 
         # copy into src/crc (replace existing files)
-        dst_h = SRC_CRC_DIR / hsrc.name
-        dst_c = SRC_CRC_DIR / csrc.name
-        dst_h.write_text(hsrc.read_text())
-        dst_c.write_text(csrc.read_text())
-        print(f"Staged {hsrc.name} -> {dst_h}")
-        print(f"Staged {csrc.name} -> {dst_c}")
-        copied += 2
-
-    print(f"Staged {copied} files into {SRC_CRC_DIR}")
+        for src in (hsrc, csrc):
+            dst = SRC_CRC_DIR / src.name
+            if is_identical(src, dst):
+                print(f"Unchanged {src.name} (already staged)")
+                unchanged += 1
+                continue
+            shutil.copyfile(src, dst)
+            print(f"Staged {src.name} -> {dst}")
+            copied += 1
+
+    print(f"Staged {copied} files into {SRC_CRC_DIR} ({unchanged} unchanged)")
     return 0
 
 
@@ -163,13 +205,18 @@ def main() -> None:
         action="store_true",
         help="Generate outputs under dist/crc/c99 but do not stage into src/crc",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate every output with pycrc instead of reusing dist/crc/.cache",
+    )
 
     args = parser.parse_args()
 
     algos = parse_algos_arg(args.algos)
 
     print("Generating C99 CRC-8 variants into:", C99_DIR)
-    generate_c99_variants(algos)
+    generate_c99_variants(algos, use_cache=not args.no_cache)
 
     if args.no_stage:
         print("Skipping staging (no changes to src/crc)")